@@ -5,25 +5,7 @@ from collections import deque
 from pathlib import Path
 from typing import Any
 
-from quote_drip import (
-    QuoteFilter,
-    _check_length,
-    _check_links,
-    _check_mentions,
-    _check_sentences,
-)
-
-
-def _build_brb_filters(config: dict[str, Any]) -> list[QuoteFilter]:
-    filters: list[QuoteFilter] = [
-        _check_length(int(config.get("max_chars", 350))),
-        _check_sentences(int(config.get("max_sentences", 3))),
-    ]
-    if config.get("no_mentions", True):
-        filters.append(_check_mentions)
-    if config.get("no_links", True):
-        filters.append(_check_links)
-    return filters
+from quote_drip import build_quote_filters, filter_quote_pool
 
 
 class BrbFeed:
@@ -43,11 +25,13 @@ class BrbFeed:
         self.interval = int(brb_config.get("interval_seconds", 15))
         buffer_size = int(brb_config.get("recent_quote_buffer", 50))
         self.log = logging.getLogger("brb.feed")
-        self.quotes = quotes
         self.weights: dict[str, int] = {
             k: int(v) for k, v in quotes_config.get("weights", {}).items()
         }
-        self.filters = _build_brb_filters(quotes_config)
+        self.filters = build_quote_filters(quotes_config)
+        self.quotes = filter_quote_pool(quotes, self.filters)
+        self._candidates = list(self.quotes)
+        self._candidate_weights = [self.weights.get(c, 1) for c in self._candidates]
         self._recent: deque[str] = deque(maxlen=buffer_size)
         self._task: asyncio.Task | None = None
         self._active = False
@@ -115,28 +99,19 @@ class BrbFeed:
             self.log.exception("Failed to write to %s.", self.output_file)
 
     def _pick_quote(self) -> str | None:
-        candidates = [c for c in self.quotes if self.quotes[c]]
+        candidates = self._candidates
         if not candidates:
             return None
-        weights = [self.weights.get(c, 1) for c in candidates]
+        weights = self._candidate_weights
 
-        # Up to 50 weighted-random attempts to find a non-recent, valid quote.
+        # Up to 50 weighted-random attempts to find a non-recent quote.
         for _ in range(50):
             character = random.choices(candidates, weights=weights, k=1)[0]
-            quote = random.choice(self.quotes[character]).strip()
-            if not quote or quote in self._recent or not self._passes_filters(quote):
-                continue
-            return quote
-
-        # Fallback: ignore recency constraint and return any valid quote.
-        self.log.debug("BRB recent buffer saturated; falling back to any valid quote.")
-        for _ in range(20):
-            character = random.choices(candidates, weights=weights, k=1)[0]
-            quote = random.choice(self.quotes[character]).strip()
-            if quote and self._passes_filters(quote):
+            quote = random.choice(self.quotes[character])
+            if quote not in self._recent:
                 return quote
 
-        return None
-
-    def _passes_filters(self, quote: str) -> bool:
-        return all(f(quote) for f in self.filters)
+        # Fallback: ignore recency constraint; every pooled quote already passes filters.
+        self.log.debug("BRB recent buffer saturated; falling back to any valid quote.")
+        character = random.choices(candidates, weights=weights, k=1)[0]
+        return random.choice(self.quotes[character])
@@ -1,25 +1,59 @@
+import functools
 import logging
 import os
 import re
+import threading
 from dataclasses import dataclass
 from typing import Any
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Logged once, on the first load (logging is not configured yet at import time).
+_warn_pure_python_yaml = _YamlLoader is yaml.SafeLoader
 
 ENV_PATTERN = re.compile(r"\$\{([A-Z0-9_]+)\}")
 
+# Parsed configs keyed by path; reused while the file's stat signature is unchanged.
+_CONFIG_CACHE: dict[str, tuple[tuple[int, int, int], "AppConfig"]] = {}
+_CONFIG_CACHE_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _env_lookup(name: str) -> str:
+    # The process environment does not change at runtime, so each name is read once.
+    return os.environ.get(name, "")
+
+
+def _env_replacer(match: re.Match[str]) -> str:
+    return _env_lookup(match.group(1))
+
 
 def _expand_env(value: Any) -> Any:
+    """Substitute ${VAR} placeholders in-place across a parsed YAML tree."""
+    replacer = _env_replacer
     if isinstance(value, str):
-        def replacer(match: re.Match[str]) -> str:
-            return os.getenv(match.group(1), "")
-
-        return ENV_PATTERN.sub(replacer, value)
-    if isinstance(value, list):
-        return [_expand_env(item) for item in value]
-    if isinstance(value, dict):
-        return {key: _expand_env(val) for key, val in value.items()}
+        return ENV_PATTERN.sub(replacer, value) if "${" in value else value
+
+    stack: list[Any] = [value]
+    while stack:
+        container = stack.pop()
+        if isinstance(container, dict):
+            items = container.items()
+        elif isinstance(container, list):
+            items = enumerate(container)
+        else:
+            continue
+        for key, item in items:
+            if isinstance(item, str):
+                if "${" in item:
+                    container[key] = ENV_PATTERN.sub(replacer, item)
+            elif isinstance(item, (dict, list)):
+                stack.append(item)
     return value
 
 
@@ -103,9 +137,26 @@ def _emit_warnings(data: dict[str, Any]) -> None:
 
 
 def load_config(path: str) -> AppConfig:
+    # (mtime_ns, size, inode) also catches atomic os.replace rewrites that keep the mtime.
+    st = os.stat(path)
+    sig = (st.st_mtime_ns, st.st_size, st.st_ino)
+    with _CONFIG_CACHE_LOCK:
+        cached = _CONFIG_CACHE.get(path)
+        if cached is not None and cached[0] == sig:
+            return cached[1]
+
+    global _warn_pure_python_yaml
+    if _warn_pure_python_yaml:
+        _warn_pure_python_yaml = False
+        logging.getLogger("config").warning(
+            "libyaml bindings not available; parsing config with the pure-Python loader."
+        )
     with open(path, "r", encoding="utf-8") as handle:
-        data = yaml.safe_load(handle) or {}
+        data = yaml.load(handle, Loader=_YamlLoader) or {}
     expanded = _expand_env(data)
     validate_config(expanded)
     _emit_warnings(expanded)
-    return AppConfig(raw=expanded, config_path=path)
+    config = AppConfig(raw=expanded, config_path=path)
+    with _CONFIG_CACHE_LOCK:
+        _CONFIG_CACHE[path] = (sig, config)
+    return config
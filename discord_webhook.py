@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from typing import Any
+from collections import defaultdict
 
 import aiohttp
 
@@ -16,15 +16,26 @@ class DiscordWebhook:
     def __init__(self, session: aiohttp.ClientSession) -> None:
         self.session = session
         self.log = logging.getLogger("discord")
+        # Discord rate-limits per webhook, so sends to one URL go out one at a time over
+        # the shared keep-alive session instead of racing each other into 429s.
+        self._url_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
 
     async def send(self, webhook_url: str, content: str) -> None:
+        async with self._url_locks[webhook_url]:
+            await self._send(webhook_url, content)
+
+    async def _send(self, webhook_url: str, content: str) -> None:
         payload = {"content": content}
+        # Bind loop invariants once; the retry loop may run several times per message.
+        post = self.session.post
+        log = self.log
+        sleep = asyncio.sleep
         error_attempts = 0
         rate_limit_attempts = 0
         while True:
-            async with self.session.post(webhook_url, json=payload) as resp:
+            async with post(webhook_url, json=payload) as resp:
                 if resp.status in (200, 204):
-                    self.log.info("Discord webhook sent.")
+                    log.info("Discord webhook sent.")
                     return
                 if resp.status == 429:
                     rate_limit_attempts += 1
@@ -32,20 +43,23 @@ class DiscordWebhook:
                         raise WebhookSendError(
                             f"Discord rate limited {rate_limit_attempts} times; giving up."
                         )
-                    data = await resp.json()
-                    retry_after = float(
-                        resp.headers.get("Retry-After", data.get("retry_after", 1))
-                    )
-                    self.log.warning(
+                    # The header is authoritative; only parse the body when it is absent.
+                    retry_after_header = resp.headers.get("Retry-After")
+                    if retry_after_header is not None:
+                        retry_after = float(retry_after_header)
+                    else:
+                        data = await resp.json()
+                        retry_after = float(data.get("retry_after", 1))
+                    log.warning(
                         "Discord rate limited (%d/%d). Retrying after %.2fs",
                         rate_limit_attempts,
                         MAX_RATE_LIMIT_RETRIES,
                         retry_after,
                     )
-                    await asyncio.sleep(retry_after)
+                    await sleep(retry_after)
                     continue
                 text = await resp.text()
-                self.log.error(
+                log.error(
                     "Discord webhook failed status=%s body=%s", resp.status, text
                 )
                 error_attempts += 1
@@ -54,4 +68,4 @@ class DiscordWebhook:
                         f"Discord webhook failed after {error_attempts} attempts "
                         f"(last status={resp.status})."
                     )
-                await asyncio.sleep(1)
+                await sleep(1)
@@ -1,4 +1,6 @@
 import asyncio
+import contextlib
+import functools
 import json
 import logging
 import logging.handlers
@@ -8,11 +10,16 @@ import tempfile
 import time
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable
 
 import aiohttp
 from aiohttp import web
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from config import load_config
 from discord_webhook import DiscordWebhook
 from twitch_helix import TwitchHelix
@@ -20,6 +27,7 @@ from twitch_polling import Poller
 
 STATE_DIR = Path(os.getenv("STATE_DIR", "data"))
 STATE_PATH = STATE_DIR / "state.json"
+STATE_FLUSH_DEBOUNCE_SECONDS = 1.0
 
 log = logging.getLogger("main")
 
@@ -41,27 +49,43 @@ HEALTH_PORT = _safe_int_env("HEALTH_PORT", 8080)
 HEALTH_STALE_SECONDS = _safe_int_env("HEALTH_STALE_SECONDS", 300)
 HEALTH_HOST = os.getenv("HEALTH_HOST", "127.0.0.1")
 CONFIG_PATH = os.getenv("CONFIG_PATH", "config.yaml")
+DEBUG_STATE_PRETTY = _safe_int_env("DEBUG_STATE_PRETTY", 0) == 1
+USER_AGENT = "sig.1852"
 
 
 def load_state() -> dict[str, Any]:
     STATE_DIR.mkdir(parents=True, exist_ok=True)
-    if STATE_PATH.exists():
+    try:
+        with STATE_PATH.open("rb") as handle:
+            data = handle.read()
+    except FileNotFoundError:
+        data = None
+    if data is not None:
         try:
-            with STATE_PATH.open("r", encoding="utf-8") as handle:
-                return json.load(handle)
-        except (json.JSONDecodeError, ValueError):
+            return orjson.loads(data) if orjson is not None else json.loads(data)
+        except ValueError:
             log.warning("Corrupted state.json detected; starting with empty state.")
     state: dict[str, Any] = {}
     save_state(state)
     return state
 
 
-def save_state(state: dict[str, Any]) -> None:
-    STATE_DIR.mkdir(parents=True, exist_ok=True)
+def _encode_state(state: dict[str, Any]) -> bytes:
+    # state.json is machine-read; compact, unsorted output keeps encode time and bytes
+    # written down. DEBUG_STATE_PRETTY=1 restores indented, sorted output for inspection.
+    if DEBUG_STATE_PRETTY:
+        return (json.dumps(state, indent=2, sort_keys=True) + "\n").encode("utf-8")
+    if orjson is not None:
+        return orjson.dumps(state, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(state, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _write_state(data: bytes) -> None:
+    # STATE_DIR is created once by load_state at startup.
     fd, tmp_path = tempfile.mkstemp(dir=STATE_DIR, suffix=".tmp")
     try:
-        with os.fdopen(fd, "w", encoding="utf-8") as handle:
-            json.dump(state, handle, indent=2, sort_keys=True)
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
         os.replace(tmp_path, STATE_PATH)
     except BaseException:
         try:
@@ -71,11 +95,58 @@ def save_state(state: dict[str, Any]) -> None:
         raise
 
 
+def save_state(state: dict[str, Any]) -> None:
+    _write_state(_encode_state(state))
+
+
+# Set by subsystems whenever they change state; drained by _state_flusher.
+_state_dirty = asyncio.Event()
+# Bumped on every change notification; lets the health endpoint reuse its last render.
+_state_version = 0
+
+
+def _mark_state_dirty(state: dict[str, Any]) -> None:
+    """save_state stand-in for subsystems: defer the write to the background flusher."""
+    global _state_version
+    _state_version += 1
+    _state_dirty.set()
+
+
+async def _state_flusher(state: dict[str, Any]) -> None:
+    """Coalesce state writes so bursts of changes hit disk at most once per debounce window."""
+    last_written: bytes | None = None
+    while True:
+        await _state_dirty.wait()
+        await asyncio.sleep(STATE_FLUSH_DEBOUNCE_SECONDS)
+        _state_dirty.clear()
+        data = _encode_state(state)
+        # Identical snapshots (e.g. a save after a no-op tick) are not rewritten.
+        if data == last_written:
+            continue
+        # Encoding above happens on the loop, so the thread only sees immutable bytes.
+        write = asyncio.ensure_future(asyncio.to_thread(_write_state, data))
+        try:
+            await asyncio.shield(write)
+        except asyncio.CancelledError:
+            # Let an in-flight write land before the shutdown save replaces it.
+            await asyncio.wait([write])
+            raise
+        except OSError:
+            log.exception("Failed to persist state; will retry on next change.")
+            continue
+        last_written = data
+
+
 def _format_duration(seconds: float) -> str:
     """Format seconds as human-readable duration like '2h 15m' or '45m 30s'."""
     if seconds < 0:
         return "now"
-    hours, remainder = divmod(int(seconds), 3600)
+    return _format_whole_duration(int(seconds))
+
+
+@functools.lru_cache(maxsize=256)
+def _format_whole_duration(seconds: int) -> str:
+    hours, remainder = divmod(seconds, 3600)
     minutes, secs = divmod(remainder, 60)
     if hours > 0:
         return f"{hours}h {minutes}m"
@@ -86,15 +157,49 @@ def _format_duration(seconds: float) -> str:
 
 def _format_timestamp(ts: float) -> str:
     """Format Unix timestamp as ISO 8601 in CST (GMT-6)."""
+    return _format_whole_timestamp(int(ts))
+
+
+@functools.lru_cache(maxsize=256)
+def _format_whole_timestamp(ts: int) -> str:
+    # Keyed on whole seconds (the format's resolution) so repeated probes reuse results.
     dt = datetime.fromtimestamp(ts, tz=CST)
     return dt.strftime("%Y-%m-%d %H:%M:%S CST")
 
 
+def _json_serialize(payload: Any) -> str:
+    """JSON encoder for aiohttp request bodies (Discord webhook payloads)."""
+    if orjson is not None:
+        return orjson.dumps(payload).decode("utf-8")
+    return json.dumps(payload)
+
+
+def _encode_health(payload: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    return json.dumps(payload, indent=2).encode("utf-8")
+
+
 async def _start_health_server(
     state: dict[str, Any], started_at: float, channel_count: int
 ) -> web.AppRunner:
+    # Last rendered (key, status, body); probes within the same second and state version
+    # reuse it instead of rebuilding and re-encoding the payload.
+    rendered: dict[str, Any] = {}
+
     async def _health_handler(request: web.Request) -> web.Response:
         now = time.time()
+        key = (int(now), _state_version)
+        if rendered.get("key") != key:
+            status, body = _render_health(now)
+            rendered.update(key=key, status=status, body=body)
+        return web.Response(
+            status=rendered["status"],
+            body=rendered["body"],
+            content_type="application/json",
+        )
+
+    def _render_health(now: float) -> tuple[int, bytes]:
         uptime = now - started_at
         last_poll = state.get("last_poll_at", 0)
         poll_age = now - last_poll if last_poll else None
@@ -120,7 +225,7 @@ async def _start_health_server(
         else:
             next_quote_in = None
 
-        body = json.dumps({
+        body = _encode_health({
             "status": "ok" if healthy else "stale",
             "server_time": _format_timestamp(now),
             "uptime": _format_duration(uptime),
@@ -141,12 +246,8 @@ async def _start_health_server(
                 "next_post_at": _format_timestamp(next_post_ts) if next_post_ts else None,
                 "next_post_in": next_quote_in,
             },
-        }, indent=2)
-        return web.Response(
-            status=200 if healthy else 503,
-            text=body,
-            content_type="application/json",
-        )
+        })
+        return (200 if healthy else 503), body
 
     async def _root_handler(request: web.Request) -> web.Response:
         return web.Response(
@@ -166,7 +267,23 @@ async def _start_health_server(
     return runner
 
 
-class _JsonFormatter(logging.Formatter):
+@functools.lru_cache(maxsize=4)
+def _format_log_second(ts: int, datefmt: str) -> str:
+    # Records logged within the same second share one strftime call.
+    return time.strftime(datefmt, time.localtime(ts))
+
+
+class _TextFormatter(logging.Formatter):
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        if datefmt:
+            return _format_log_second(int(record.created), datefmt)
+        base = _format_log_second(int(record.created), self.default_time_format)
+        return self.default_msec_format % (base, record.msecs)
+
+
+class _JsonFormatter(_TextFormatter):
+    """One JSON object per record; "ts" uses the same cached timestamp rendering as text logs."""
+
     def format(self, record: logging.LogRecord) -> str:
         entry = {
             "ts": self.formatTime(record),
@@ -176,7 +293,9 @@ class _JsonFormatter(logging.Formatter):
         }
         if record.exc_info and record.exc_info[1]:
             entry["exception"] = self.formatException(record.exc_info)
-        return json.dumps(entry)
+        if orjson is not None:
+            return orjson.dumps(entry).decode("utf-8")
+        return json.dumps(entry, separators=(",", ":"))
 
 
 def _setup_logging() -> None:
@@ -191,7 +310,7 @@ def _setup_logging() -> None:
     if log_format == "json":
         formatter = _JsonFormatter()
     else:
-        formatter = logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        formatter = _TextFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
 
     console = logging.StreamHandler()
     console.setFormatter(formatter)
@@ -205,6 +324,16 @@ def _setup_logging() -> None:
         root.addHandler(file_handler)
 
 
+class _Shutdown(Exception):
+    """Raised inside the task group to stop every subsystem and begin teardown."""
+
+
+async def _until_done(awaitable: Awaitable[None]) -> None:
+    # Any subsystem finishing (or the shutdown signal firing) ends the whole service.
+    await awaitable
+    raise _Shutdown
+
+
 async def main() -> None:
     _setup_logging()
     config = load_config(CONFIG_PATH)
@@ -222,13 +351,27 @@ async def main() -> None:
 
     health_runner = await _start_health_server(state, time.time(), len(config.channels))
 
-    async with aiohttp.ClientSession() as session:
+    # One pooled session for Helix and Discord; a long keepalive keeps TLS connections
+    # warm across poll intervals instead of re-handshaking every cycle.
+    connector = aiohttp.TCPConnector(
+        limit=32,
+        limit_per_host=8,
+        keepalive_timeout=120,
+        ttl_dns_cache=300,
+        enable_cleanup_closed=True,
+    )
+    async with aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=30, connect=10),
+        headers={"User-Agent": USER_AGENT},
+        json_serialize=_json_serialize,
+    ) as session:
         helix = TwitchHelix(
             config.twitch["client_id"], config.twitch["client_secret"], session
         )
         webhook = DiscordWebhook(session)
 
-        tasks: list[asyncio.Task] = []
+        services: list[Awaitable[None]] = []
 
         polling_config = config.raw.get("polling", {})
         if polling_config.get("enabled", True):
@@ -237,10 +380,10 @@ async def main() -> None:
                 helix=helix,
                 webhook=webhook,
                 state=state,
-                save_state=save_state,
+                save_state=_mark_state_dirty,
                 interval_seconds=int(polling_config.get("interval_seconds", 90)),
             )
-            tasks.append(asyncio.create_task(poller.run()))
+            services.append(poller.run())
 
         quotes_config = config.raw.get("quotes", {})
         quotes_enabled = quotes_config.get("enabled", False)
@@ -250,26 +393,24 @@ async def main() -> None:
         # Load quotes once and share the dict across all subsystems that need it.
         loaded_quotes: dict = {}
         if quotes_enabled or chat_enabled:
-            from quote_drip import QuoteDrip, load_quotes
-            from pathlib import Path
+            from quote_drip import QuoteDrip, load_quotes_async
 
+            loaded_quotes = await load_quotes_async(
+                Path(quotes_config.get("quotes_dir", "quotes")),
+                quotes_config.get("files", {}),
+                logging.getLogger("quotes"),
+            )
             if quotes_enabled:
                 quote_drip = QuoteDrip(
                     quotes_config=quotes_config,
                     characters=config.discord.get("characters", {}),
                     webhook=webhook,
                     state=state,
-                    save_state=save_state,
+                    save_state=_mark_state_dirty,
+                    quotes=loaded_quotes,
                 )
                 loaded_quotes = quote_drip.quotes
-                tasks.append(asyncio.create_task(quote_drip.run()))
-            else:
-                # Chat is enabled but quote drip is not — load quotes without scheduling.
-                loaded_quotes = load_quotes(
-                    Path(quotes_config.get("quotes_dir", "quotes")),
-                    quotes_config.get("files", {}),
-                    log,
-                )
+                services.append(quote_drip.run())
 
         if chat_enabled:
             from brb_feed import BrbFeed
@@ -285,31 +426,49 @@ async def main() -> None:
                 discord_webhook=webhook,
                 quotes=loaded_quotes,
                 state=state,
-                save_state=save_state,
+                save_state=_mark_state_dirty,
                 brb_feed=brb,
             )
-            tasks.append(asyncio.create_task(chat.run()))
+            services.append(chat.run())
 
-        if not tasks:
+        if not services:
             log.warning("No tasks enabled (polling disabled, quotes disabled, chat disabled).")
             return
 
-        shutdown_task = asyncio.create_task(shutdown_event.wait())
-        done, pending = await asyncio.wait(
-            [*tasks, shutdown_task], return_when=asyncio.FIRST_COMPLETED
-        )
-        for task in pending:
-            task.cancel()
-        for task in pending:
+        async with contextlib.AsyncExitStack() as stack:
+            # Exit callbacks run in reverse: stop the health server, then flush state.
+            stack.callback(save_state, state)
+            stack.push_async_callback(health_runner.cleanup)
             try:
-                await task
-            except asyncio.CancelledError:
+                async with asyncio.TaskGroup() as group:
+                    for service in services:
+                        group.create_task(_until_done(service))
+                    group.create_task(_until_done(shutdown_event.wait()))
+                    group.create_task(_state_flusher(state))
+            except* _Shutdown:
                 pass
 
-        await health_runner.cleanup()
-        save_state(state)
         log.info("Shutdown complete.")
 
 
+def _apply_cpu_affinity() -> None:
+    """Pin the process to the CPUs listed in CPU_AFFINITY (e.g. "0" or "2,3"), if set."""
+    raw = os.getenv("CPU_AFFINITY", "")
+    if not raw:
+        return
+    try:
+        cpus = {int(part) for part in raw.split(",") if part.strip()}
+        os.sched_setaffinity(0, cpus)
+    except (AttributeError, ValueError, OSError):
+        # sched_setaffinity is Linux-only; bad values leave scheduling untouched.
+        log.warning("Ignoring CPU_AFFINITY=%r; could not apply it.", raw)
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    _apply_cpu_affinity()
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -1,18 +1,73 @@
 import asyncio
 import logging
+import os
 import random
 import re
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Callable
+from typing import Callable
 
 from discord_webhook import DiscordWebhook
 
 MAX_DAILY_QUOTES = 3
 
+_BLOCK_RE = re.compile(r"\n\s*\n")
+# One match per non-blank run of text between sentence terminators.
+_SENTENCE_RE = re.compile(r"[^.!?]*[^.!?\s][^.!?]*")
+# "<@" also covers role mentions ("<@&"); link matching is case-insensitive like before.
+_MENTION_RE = re.compile(r"@everyone|@here|<@")
+_LINK_RE = re.compile(r"https?://|www\.", re.IGNORECASE)
+# Both checks in one scan for the default config; mentions stay case-sensitive.
+_BANNED_RE = re.compile(r"@everyone|@here|<@|(?i:https?://|www\.)")
+
 QuoteFilter = Callable[[str], bool]
 
+_O_NOATIME = getattr(os, "O_NOATIME", 0)
+
+
+def _read_bytes(path: Path) -> bytes:
+    """Read a whole file without touching its atime, hinting sequential access (Linux)."""
+    try:
+        fd = os.open(path, os.O_RDONLY | _O_NOATIME)
+    except PermissionError:
+        if not _O_NOATIME:
+            raise
+        # O_NOATIME is only allowed for the file's owner (not the case in the Docker image).
+        fd = os.open(path, os.O_RDONLY)
+    with os.fdopen(fd, "rb") as handle:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        return handle.read()
+
+
+def _read_quote_file(file_path: Path) -> bytes | None:
+    try:
+        return _read_bytes(file_path)
+    except FileNotFoundError:
+        return None
+
+
+def _add_quotes(
+    quotes: dict[str, list[str]],
+    character: str,
+    file_path: Path,
+    content: bytes | None,
+    log: logging.Logger,
+) -> None:
+    if content is None:
+        log.warning("Missing quotes file %s for character %s", file_path, character)
+        return
+    # Decode once and apply the universal-newline translation text-mode open() used to do;
+    # str \s and strip() also treat Unicode whitespace (NBSP, U+3000) as blank.
+    text = content.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+    blocks = [stripped for block in _BLOCK_RE.split(text) if (stripped := block.strip())]
+    if blocks:
+        quotes[character] = blocks
+        log.info("Loaded %d quotes for %s", len(blocks), character)
+    else:
+        log.warning("No quotes found in %s", file_path)
+
 
 def load_quotes(
     quotes_dir: Path, files_map: dict[str, str], log: logging.Logger
@@ -20,18 +75,21 @@ def load_quotes(
     quotes: dict[str, list[str]] = {}
     for character, filename in files_map.items():
         file_path = quotes_dir / filename
-        if not file_path.exists():
-            log.warning("Missing quotes file %s for character %s", file_path, character)
-            continue
-        with file_path.open("r", encoding="utf-8") as handle:
-            content = handle.read()
-        blocks = [block.strip() for block in re.split(r"\n\s*\n", content)]
-        blocks = [b for b in blocks if b]
-        if blocks:
-            quotes[character] = blocks
-            log.info("Loaded %d quotes for %s", len(blocks), character)
-        else:
-            log.warning("No quotes found in %s", file_path)
+        _add_quotes(quotes, character, file_path, _read_quote_file(file_path), log)
+    return quotes
+
+
+async def load_quotes_async(
+    quotes_dir: Path, files_map: dict[str, str], log: logging.Logger
+) -> dict[str, list[str]]:
+    """load_quotes, with the files read concurrently in worker threads."""
+    paths = {character: quotes_dir / filename for character, filename in files_map.items()}
+    contents = await asyncio.gather(
+        *(asyncio.to_thread(_read_quote_file, path) for path in paths.values())
+    )
+    quotes: dict[str, list[str]] = {}
+    for (character, file_path), content in zip(paths.items(), contents):
+        _add_quotes(quotes, character, file_path, content, log)
     return quotes
 
 
@@ -42,25 +100,72 @@ def _check_length(max_chars: int) -> QuoteFilter:
 
 
 def _check_mentions(quote: str) -> bool:
-    return not any(
-        marker in quote for marker in ("@everyone", "@here", "<@", "<@&")
-    )
+    return _MENTION_RE.search(quote) is None
 
 
 def _check_links(quote: str) -> bool:
-    lowered = quote.lower()
-    return not any(
-        prefix in lowered for prefix in ("http://", "https://", "www.")
-    )
+    return _LINK_RE.search(quote) is None
+
+
+def _check_mentions_and_links(quote: str) -> bool:
+    return _BANNED_RE.search(quote) is None
 
 
 def _check_sentences(max_sentences: int) -> QuoteFilter:
     def check(quote: str) -> bool:
-        sentences = [s for s in re.split(r"[.!?]", quote) if s.strip()]
-        return len(sentences) <= max_sentences
+        # n terminators make at most n + 1 sentences; most quotes pass without a scan.
+        if quote.count(".") + quote.count("!") + quote.count("?") < max_sentences:
+            return True
+        count = 0
+        for _ in _SENTENCE_RE.finditer(quote):
+            count += 1
+            if count > max_sentences:
+                return False
+        return True
     return check
 
 
+def build_quote_filters(config: dict) -> list[QuoteFilter]:
+    """Filters from a quotes config section; shared by QuoteDrip, BrbFeed and chat."""
+    filters: list[QuoteFilter] = [
+        _check_length(int(config.get("max_chars", 350))),
+        _check_sentences(int(config.get("max_sentences", 3))),
+    ]
+    no_mentions = config.get("no_mentions", True)
+    no_links = config.get("no_links", True)
+    if no_mentions and no_links:
+        filters.append(_check_mentions_and_links)
+    elif no_mentions:
+        filters.append(_check_mentions)
+    elif no_links:
+        filters.append(_check_links)
+    return filters
+
+
+def filter_quote_pool(
+    quotes: dict[str, list[str]],
+    filters: list[QuoteFilter],
+    log: logging.Logger | None = None,
+) -> dict[str, list[str]]:
+    """Keep the non-empty quotes that pass every filter, dropping characters left empty.
+
+    Filters depend only on quote text and config, so callers resolve their pool once
+    at construction. Drops are logged only when a logger is given.
+    """
+    filtered: dict[str, list[str]] = {}
+    for character, blocks in quotes.items():
+        valid = [quote for quote in blocks if quote and all(f(quote) for f in filters)]
+        if log is not None:
+            dropped = len(blocks) - len(valid)
+            if dropped:
+                log.info("Filtered out %d of %d quotes for %s", dropped, len(blocks), character)
+            if not valid:
+                log.warning("No quotes for %s pass the configured filters", character)
+        if valid:
+            filtered[character] = valid
+    return filtered
+
+
 class QuoteDrip:
     def __init__(
         self,
@@ -69,6 +174,7 @@ class QuoteDrip:
         webhook: DiscordWebhook,
         state: dict,
         save_state: Callable[[dict], None],
+        quotes: dict[str, list[str]] | None = None,
     ) -> None:
         self.quotes_config = quotes_config
         self.characters = characters
@@ -76,64 +182,67 @@ class QuoteDrip:
         self.state = state
         self.save_state = save_state
         self.log = logging.getLogger("quotes")
+        # The shared state dict is mutated in place and never replaced, so the
+        # "quotes" sub-dict reference stays valid for the process lifetime.
+        self._quote_state: dict = state.setdefault("quotes", {})
         self.quotes_dir = Path(quotes_config.get("quotes_dir", "quotes"))
         self.daily_min = int(quotes_config.get("daily_min", 1))
         self.daily_max = min(int(quotes_config.get("daily_max", 3)), MAX_DAILY_QUOTES)
         self.weights: dict[str, int] = {
             k: int(v) for k, v in quotes_config.get("weights", {}).items()
         }
-        self.filters = self._build_filters(quotes_config)
-        self.quotes = load_quotes(
-            self.quotes_dir, quotes_config.get("files", {}), self.log
-        )
-
-    @staticmethod
-    def _build_filters(config: dict) -> list[QuoteFilter]:
-        filters: list[QuoteFilter] = [
-            _check_length(int(config.get("max_chars", 350))),
-            _check_sentences(int(config.get("max_sentences", 3))),
+        self.filters = build_quote_filters(quotes_config)
+        if quotes is None:
+            quotes = load_quotes(self.quotes_dir, quotes_config.get("files", {}), self.log)
+        self.quotes = filter_quote_pool(quotes, self.filters, self.log)
+        # In-memory shuffle orders regenerated from the persisted seed, per character.
+        self._orders: dict[str, tuple[int, list[int]]] = {}
+        # Characters and weights are fixed after load. Zero-weight characters are never
+        # picked, matching the previous random.choices behaviour.
+        self._char_weights: list[tuple[str, float]] = [
+            (c, float(self.weights.get(c, 1)))
+            for c in self.quotes
+            if self.weights.get(c, 1) > 0
         ]
-        if config.get("no_mentions", True):
-            filters.append(_check_mentions)
-        if config.get("no_links", True):
-            filters.append(_check_links)
-        return filters
 
     async def run(self) -> None:
         if not self.quotes:
-            self.log.warning("No quotes loaded; quote drip disabled.")
+            self.log.warning(
+                "No quotes loaded or none pass the filters; quote drip disabled. "
+                "Other services will continue running."
+            )
+            # Block forever: a finished service ends main's TaskGroup and the other services.
+            await asyncio.Event().wait()
             return
         while True:
             self._ensure_daily_state()
-            quote_state = self.state.setdefault("quotes", {})
-            now = time.time()
-            next_post_at = quote_state.get("next_post_at")
-
-            if next_post_at is None or next_post_at <= now:
-                if quote_state.get("daily_posted", 0) >= quote_state.get("daily_quota", 0):
-                    next_day = self._start_of_next_day()
-                    quote_state["next_post_at"] = next_day.timestamp()
-                    self.save_state(self.state)
-                elif quote_state.get("_exhausted", False):
-                    next_day = self._start_of_next_day()
-                    quote_state["next_post_at"] = next_day.timestamp()
-                    self.save_state(self.state)
-                    self.log.info("All quotes exhausted for today; sleeping until tomorrow.")
-                else:
-                    posted = await self._post_random_quote()
-                    if posted:
-                        quote_state["daily_posted"] = quote_state.get("daily_posted", 0) + 1
-                    else:
-                        quote_state["_exhausted"] = True
-                    quote_state["next_post_at"] = self._schedule_next()
-                    self.save_state(self.state)
-                    next_post_at = quote_state["next_post_at"]
-
-            sleep_for = max(1, (next_post_at or time.time()) - time.time())
-            await asyncio.sleep(sleep_for)
+            quote_state = self._quote_state
+            # next_post_at is a persisted wall-clock target, so the delta stays on time.time().
+            # It never lies past the next midnight, so rollover is re-checked on wake.
+            delay = (quote_state.get("next_post_at") or 0) - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                await self._post_and_schedule()
+
+    async def _post_and_schedule(self) -> None:
+        quote_state = self._quote_state
+        if quote_state.get("daily_posted", 0) >= quote_state.get("daily_quota", 0):
+            quote_state["next_post_at"] = self._start_of_next_day().timestamp()
+        elif quote_state.get("_exhausted", False):
+            quote_state["next_post_at"] = self._start_of_next_day().timestamp()
+            self.log.info("All quotes exhausted for today; sleeping until tomorrow.")
+        else:
+            posted = await self._post_random_quote()
+            if posted:
+                quote_state["daily_posted"] = quote_state.get("daily_posted", 0) + 1
+            else:
+                quote_state["_exhausted"] = True
+            quote_state["next_post_at"] = self._schedule_next()
+        self.save_state(self.state)
 
     def _ensure_daily_state(self) -> None:
-        quote_state = self.state.setdefault("quotes", {})
+        quote_state = self._quote_state
         today = datetime.now().date().isoformat()
         if quote_state.get("date") != today:
             quote_state["date"] = today
@@ -158,59 +267,58 @@ class QuoteDrip:
         now = datetime.now()
         return datetime.combine(now.date(), datetime.min.time()) + timedelta(days=1)
 
-    def _pick_weighted_character(self) -> list[str]:
-        candidates = list(self.quotes.keys())
-        if not candidates:
-            return []
-        weights = [self.weights.get(c, 1) for c in candidates]
-        return random.choices(candidates, weights=weights, k=len(candidates))
+    def _weighted_character_order(self) -> list[str]:
+        """Weighted random permutation of characters (Efraimidis-Spirakis sampling).
+
+        Sorting ascending by Exp(weight) keys is equivalent to sorting u ** (1/w)
+        descending, without the precision loss as large weights push keys toward 1.0.
+        """
+        keyed = [
+            (random.expovariate(weight), character)
+            for character, weight in self._char_weights
+        ]
+        keyed.sort()
+        return [character for _, character in keyed]
 
     async def _post_random_quote(self) -> bool:
-        quote_state = self.state.setdefault("quotes", {})
+        """Send one quote; the caller (run) persists the updated cursor state."""
+        quote_state = self._quote_state
         character_state = quote_state.setdefault("characters", {})
 
-        # Build a deduplicated weighted order
-        seen: set[str] = set()
-        order: list[str] = []
-        for c in self._pick_weighted_character():
-            if c not in seen:
-                seen.add(c)
-                order.append(c)
-
-        for character in order:
-            remaining = character_state.setdefault(character, {}).get("remaining_indices")
-            if not remaining:
-                remaining = list(range(len(self.quotes[character])))
-                random.shuffle(remaining)
-                character_state[character] = {"remaining_indices": remaining}
-            quote = self._next_valid_quote(character, remaining)
+        for character in self._weighted_character_order():
+            quote = self._next_quote(character, character_state)
             if quote is None:
                 continue
             webhook_url = self.characters.get(character)
             if not webhook_url:
                 continue
             await self.webhook.send(webhook_url, quote)
-            self.save_state(self.state)
             self.log.info("Posted quote for %s", character)
             return True
 
-        self.save_state(self.state)
         self.log.warning("No valid quotes found to post.")
         return False
 
-    def _next_valid_quote(self, character: str, remaining: list[int]) -> str | None:
+    def _next_quote(self, character: str, character_state: dict) -> str | None:
+        """Advance the character's persisted shuffle cursor and return the quote there."""
         quotes = self.quotes.get(character, [])
-        while remaining:
-            index = remaining.pop()
-            if index >= len(quotes):
-                continue
-            quote = quotes[index].strip()
-            if not quote:
-                continue
-            if not self._passes_filters(quote):
-                continue
-            return quote
-        return None
+        count = len(quotes)
+        if not count:
+            return None
+        entry = character_state.get(character) or {}
+        # Only (seed, cursor, count) is persisted; a changed count (edited file or
+        # filters), an exhausted cycle, or the old remaining_indices format restarts.
+        if "seed" not in entry or entry.get("count") != count or entry["cursor"] >= count:
+            entry = {"seed": random.getrandbits(32), "cursor": 0, "count": count}
+            character_state[character] = entry
+        order = self._shuffled_order(character, entry["seed"], count)
+        index = order[entry["cursor"]]
+        entry["cursor"] += 1
+        return quotes[index]
 
-    def _passes_filters(self, quote: str) -> bool:
-        return all(f(quote) for f in self.filters)
+    def _shuffled_order(self, character: str, seed: int, count: int) -> list[int]:
+        cached = self._orders.get(character)
+        if cached is None or cached[0] != seed:
+            cached = (seed, random.Random(seed).sample(range(count), count))
+            self._orders[character] = cached
+        return cached[1]
@@ -11,13 +11,7 @@ from twitchio.ext import commands
 from brb_feed import BrbFeed
 from config import AppConfig
 from discord_webhook import DiscordWebhook
-from quote_drip import (
-    QuoteFilter,
-    _check_length,
-    _check_links,
-    _check_mentions,
-    _check_sentences,
-)
+from quote_drip import QuoteFilter, build_quote_filters, filter_quote_pool
 
 CHAT_DISPLAY_NAMES = {
     "loop_trace": "loop.trace",
@@ -66,7 +60,6 @@ class TwitchChat:
     ) -> None:
         self.config = config
         self.webhook = discord_webhook
-        self.quotes = quotes
         self.state = state
         self.save_state = save_state
         self.brb_feed = brb_feed
@@ -89,19 +82,12 @@ class TwitchChat:
         self._chat_weights: dict[str, int] = {
             k: int(v) for k, v in quotes_config.get("weights", {}).items()
         }
-        self._chat_filters: list[QuoteFilter] = self._build_chat_filters(quotes_config)
-
-    @staticmethod
-    def _build_chat_filters(quotes_config: dict) -> list[QuoteFilter]:
-        filters: list[QuoteFilter] = [
-            _check_length(int(quotes_config.get("max_chars", 350))),
-            _check_sentences(int(quotes_config.get("max_sentences", 3))),
+        self._chat_filters: list[QuoteFilter] = build_quote_filters(quotes_config)
+        self._chat_quotes = filter_quote_pool(quotes, self._chat_filters)
+        self._chat_candidates = list(self._chat_quotes)
+        self._chat_candidate_weights = [
+            self._chat_weights.get(c, 1) for c in self._chat_candidates
         ]
-        if quotes_config.get("no_mentions", True):
-            filters.append(_check_mentions)
-        if quotes_config.get("no_links", True):
-            filters.append(_check_links)
-        return filters
 
     async def run(self) -> None:
         if not self._token:
@@ -109,7 +95,7 @@ class TwitchChat:
                 "TWITCH_CHAT_TOKEN is not set; chat integration disabled. "
                 "Other services will continue running."
             )
-            # Block forever so FIRST_COMPLETED doesn't trigger shutdown.
+            # Block forever: a finished service ends main's TaskGroup and the other services.
             await asyncio.Event().wait()
             return
         self._bot = _Bot(token=self._token, channel=self._channel, parent=self)
@@ -233,32 +219,24 @@ class TwitchChat:
 
     def _pick_chat_quote(self, recent: deque[str]) -> tuple[str, str] | None:
         """Return (quote_text, character) or None if no valid quote is found."""
-        candidates = [c for c in self.quotes if self.quotes[c]]
+        candidates = self._chat_candidates
         if not candidates:
             return None
 
-        weights = [self._chat_weights.get(c, 1) for c in candidates]
+        weights = self._chat_candidate_weights
         recent_set = set(recent)
 
-        # Up to 50 weighted-random attempts to find a non-recent, valid quote.
+        # Up to 50 weighted-random attempts to find a non-recent quote.
         for _ in range(50):
             character = random.choices(candidates, weights=weights, k=1)[0]
-            quote = random.choice(self.quotes[character]).strip()
-            if not quote or quote in recent_set:
-                continue
-            if not all(f(quote) for f in self._chat_filters):
-                continue
-            return quote, character
-
-        # Fallback: ignore recency constraint.
-        self.log.debug("Chat recent buffer saturated; falling back to any valid quote.")
-        for _ in range(20):
-            character = random.choices(candidates, weights=weights, k=1)[0]
-            quote = random.choice(self.quotes[character]).strip()
-            if quote and all(f(quote) for f in self._chat_filters):
+            quote = random.choice(self._chat_quotes[character])
+            if quote not in recent_set:
                 return quote, character
 
-        return None
+        # Fallback: ignore recency constraint; every pooled quote already passes filters.
+        self.log.debug("Chat recent buffer saturated; falling back to any valid quote.")
+        character = random.choices(candidates, weights=weights, k=1)[0]
+        return random.choice(self._chat_quotes[character]), character
 
     def _format_chat_message(self, character: str, quote: str) -> str:
         """Prepend the character display name unless the quote is already self-identified."""
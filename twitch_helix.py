@@ -1,10 +1,26 @@
+import asyncio
 import logging
 import time
-from typing import Any
+from itertools import islice
+from typing import Any, Iterable
 
 import aiohttp
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 HELIX_BATCH_SIZE = 100
+HELIX_MAX_CONCURRENCY = 4
+USERS_CACHE_TTL = 24 * 3600
+
+
+async def _read_json(resp: aiohttp.ClientResponse) -> Any:
+    # orjson decodes the raw body directly, skipping aiohttp's bytes -> str step.
+    if orjson is not None:
+        return orjson.loads(await resp.read())
+    return await resp.json()
 
 
 class TwitchHelix:
@@ -15,10 +31,21 @@ class TwitchHelix:
         self.log = logging.getLogger("twitch.helix")
         self._token: str | None = None
         self._token_expires_at: float = 0.0
+        # Concurrent batches share one token fetch and a bounded number of in-flight requests.
+        self._token_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(HELIX_MAX_CONCURRENCY)
+        # login -> (monotonic fetch time, user record); survives config reloads.
+        self._users_cache: dict[str, tuple[float, dict[str, Any]]] = {}
 
     async def get_app_token(self) -> str:
         if self._token and time.monotonic() < self._token_expires_at:
             return self._token
+        async with self._token_lock:
+            if self._token and time.monotonic() < self._token_expires_at:
+                return self._token
+            return await self._fetch_app_token()
+
+    async def _fetch_app_token(self) -> str:
         url = "https://id.twitch.tv/oauth2/token"
         params = {
             "client_id": self.client_id,
@@ -27,7 +54,7 @@ class TwitchHelix:
         }
         async with self.session.post(url, params=params) as resp:
             resp.raise_for_status()
-            data = await resp.json()
+            data = await _read_json(resp)
         self._token = data["access_token"]
         expires_in = int(data.get("expires_in", 3600))
         # Refresh 5 minutes before actual expiry
@@ -49,33 +76,51 @@ class TwitchHelix:
                     method, url, headers=headers, params=params, json=json
                 ) as retry_resp:
                     retry_resp.raise_for_status()
-                    return await retry_resp.json()
+                    return await _read_json(retry_resp)
             resp.raise_for_status()
-            return await resp.json()
+            return await _read_json(resp)
+
+    async def _get_batched(
+        self, url: str, key: str, values: Iterable[str]
+    ) -> list[dict[str, Any]]:
+        async def fetch(params: list[tuple[str, str]]) -> list[dict[str, Any]]:
+            async with self._semaphore:
+                data = await self._request("GET", url, params=params)
+            return data.get("data", [])
+
+        # Build each batch's query params straight from the iterator; no full id list.
+        batches: list[list[tuple[str, str]]] = []
+        it = iter(values)
+        while batch := [(key, value) for value in islice(it, HELIX_BATCH_SIZE)]:
+            batches.append(batch)
+        # TaskGroup cancels the remaining batches as soon as one fails, so no request
+        # keeps a semaphore slot past this call.
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(fetch(batch)) for batch in batches]
+        except BaseExceptionGroup as exc_group:
+            # Callers handle plain aiohttp errors (e.g. the poller's 429 backoff).
+            raise exc_group.exceptions[0] from None
+        return [item for task in tasks for item in task.result()]
 
     async def get_users(self, logins: list[str]) -> dict[str, dict[str, Any]]:
+        now = time.monotonic()
         result: dict[str, dict[str, Any]] = {}
-        for idx in range(0, len(logins), HELIX_BATCH_SIZE):
-            batch = logins[idx : idx + HELIX_BATCH_SIZE]
-            data = await self._request(
-                "GET",
-                "https://api.twitch.tv/helix/users",
-                params=[("login", login) for login in batch],
-            )
-            for item in data.get("data", []):
-                result[item["login"].lower()] = item
+        stale: list[str] = []
+        for login in logins:
+            cached = self._users_cache.get(login)
+            if cached is not None and now - cached[0] < USERS_CACHE_TTL:
+                result[login] = cached[1]
+            else:
+                stale.append(login)
+        if stale:
+            items = await self._get_batched("https://api.twitch.tv/helix/users", "login", stale)
+            for item in items:
+                login = item["login"].lower()
+                self._users_cache[login] = (now, item)
+                result[login] = item
         return result
 
-    async def get_streams(self, user_ids: list[str]) -> list[dict[str, Any]]:
-        if not user_ids:
-            return []
-        results: list[dict[str, Any]] = []
-        for idx in range(0, len(user_ids), HELIX_BATCH_SIZE):
-            batch = user_ids[idx : idx + HELIX_BATCH_SIZE]
-            data = await self._request(
-                "GET",
-                "https://api.twitch.tv/helix/streams",
-                params=[("user_id", uid) for uid in batch],
-            )
-            results.extend(data.get("data", []))
-        return results
+    async def get_streams(self, user_ids: Iterable[str]) -> list[dict[str, Any]]:
+        # An empty id set makes no batches, so no request is sent.
+        return await self._get_batched("https://api.twitch.tv/helix/streams", "user_id", user_ids)
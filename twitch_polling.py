@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import random
 import time
 from typing import Any, Callable
 
@@ -10,6 +11,8 @@ from discord_webhook import DiscordWebhook
 from twitch_helix import TwitchHelix
 
 MAX_BACKOFF_MULTIPLIER = 8
+# Beyond this many failures 2 ** n already exceeds the cap; clamping keeps n small.
+_MAX_BACKOFF_EXPONENT = MAX_BACKOFF_MULTIPLIER.bit_length()
 
 
 class _SafeDict(dict):
@@ -19,7 +22,33 @@ class _SafeDict(dict):
         return f"{{{key}}}"
 
 
+def _compile_template(template: str, **static: Any) -> Callable[..., str]:
+    """Bind a template's format_map and its per-channel fields once; calls supply the rest."""
+    render = template.format_map
+
+    def compiled(**kwargs: Any) -> str:
+        return render(_SafeDict(static, **kwargs))
+
+    return compiled
+
+
 class Poller:
+    __slots__ = (
+        "config",
+        "helix",
+        "webhook",
+        "state",
+        "save_state",
+        "interval_seconds",
+        "log",
+        "channel_info",
+        "id_map",
+        "_consecutive_failures",
+        "_retry_after",
+        "_live_now",
+        "_config_mtime",
+    )
+
     def __init__(
         self,
         config: AppConfig,
@@ -39,16 +68,21 @@ class Poller:
         self.channel_info: dict[str, dict[str, Any]] = {}
         self.id_map: dict[str, dict[str, Any]] = {}
         self._consecutive_failures = 0
+        # Set from a Helix 429's reset headers; overrides the exponential backoff once.
+        self._retry_after: float | None = None
+        # Mirror of state["live_now"], kept as a set so polls can detect transitions.
+        self._live_now: frozenset[str] = frozenset()
 
     async def initialize(self) -> None:
-        logins = [channel["login"].lower() for channel in self.config.channels]
-        user_map = await self.helix.get_users(logins)
-        if len(user_map) != len(logins):
-            missing = set(logins) - set(user_map.keys())
+        login_to_channel = {
+            channel["login"].lower(): channel for channel in self.config.channels
+        }
+        user_map = await self.helix.get_users(list(login_to_channel))
+        missing = login_to_channel.keys() - user_map.keys()
+        if missing:
             self.log.warning("Missing Twitch users: %s", ", ".join(sorted(missing)))
 
-        for channel in self.config.channels:
-            login = channel["login"].lower()
+        for login, channel in login_to_channel.items():
             user = user_map.get(login)
             if not user:
                 continue
@@ -64,6 +98,15 @@ class Poller:
                     "{display_name} is live! {url}",
                 ),
             }
+            info["url"] = f"https://twitch.tv/{login}"
+            info["render_online"] = _compile_template(
+                info["template_online"],
+                login=login,
+                display_name=info["display_name"],
+                url=info["url"],
+            )
+            # Resolve once here so unknown-character warnings fire at load, not per announce.
+            info["webhook_url"] = self._resolve_webhook(info)
             self.channel_info[login] = info
             self.id_map[user["id"]] = info
 
@@ -99,10 +142,19 @@ class Poller:
             self.log.exception("Failed to reload config; keeping current.")
 
     def _next_sleep(self) -> float:
+        if self._retry_after is not None:
+            # Never poll faster than the normal interval, even if the limit resets sooner.
+            delay = max(self._retry_after, self.interval_seconds)
+            self._retry_after = None
+            self.log.info("Rate limited: sleeping %ds until the Helix limit resets.", delay)
+            return delay
         if self._consecutive_failures <= 0:
             return self.interval_seconds
-        multiplier = min(2 ** self._consecutive_failures, MAX_BACKOFF_MULTIPLIER)
-        backed_off = self.interval_seconds * multiplier
+        exponent = min(self._consecutive_failures, _MAX_BACKOFF_EXPONENT)
+        multiplier = min(2 ** exponent, MAX_BACKOFF_MULTIPLIER)
+        # Jitter below the cap keeps restarted or parallel instances from retrying in
+        # lockstep without ever exceeding MAX_BACKOFF_MULTIPLIER.
+        backed_off = self.interval_seconds * multiplier * random.uniform(0.5, 1.0)
         self.log.info(
             "Backing off: %d consecutive failures, sleeping %ds.",
             self._consecutive_failures,
@@ -110,27 +162,53 @@ class Poller:
         )
         return backed_off
 
+    @staticmethod
+    def _rate_limit_delay(headers: Any) -> float | None:
+        """Seconds until Helix accepts requests again, from Retry-After or Ratelimit-Reset."""
+        if not headers:
+            return None
+        try:
+            retry_after = headers.get("Retry-After")
+            if retry_after is not None:
+                return float(retry_after)
+            reset_at = headers.get("Ratelimit-Reset")
+            if reset_at is not None:
+                return float(reset_at) - time.time()
+        except ValueError:
+            pass
+        return None
+
     def _ensure_state_shape(self) -> None:
         self.state.setdefault("last_started_at_announced", {})
         if self.state.get("live_now") is None:
             self.state["live_now"] = []
             self.save_state(self.state)
+        self._live_now = frozenset(self.state["live_now"])
 
     async def _poll_once(self) -> None:
         if not self.id_map:
             self.log.warning("No valid Twitch channels configured; skipping poll.")
             return
+        # Only a poll that changed live/announced state needs persisting; errors save anyway.
+        changed = True
         try:
             streams = await self._fetch_live_streams()
-            await self._handle_streams(streams)
+            changed = await self._handle_streams(streams)
             self._consecutive_failures = 0
             self.state["last_poll_at"] = time.time()
-        except aiohttp.ClientError:
+        except aiohttp.ClientError as exc:
             self._consecutive_failures += 1
-            self.log.exception(
-                "Network error during poll (failure #%d); will retry.",
-                self._consecutive_failures,
-            )
+            if isinstance(exc, aiohttp.ClientResponseError) and exc.status == 429:
+                self._retry_after = self._rate_limit_delay(exc.headers)
+                self.log.warning(
+                    "Helix rate limited during poll (failure #%d); will retry.",
+                    self._consecutive_failures,
+                )
+            else:
+                self.log.exception(
+                    "Network error during poll (failure #%d); will retry.",
+                    self._consecutive_failures,
+                )
         except Exception:
             self._consecutive_failures += 1
             self.log.exception(
@@ -138,56 +216,63 @@ class Poller:
                 self._consecutive_failures,
             )
         finally:
-            self.save_state(self.state)
+            if changed:
+                self.save_state(self.state)
 
     async def _fetch_live_streams(self) -> list[dict[str, Any]]:
-        broadcaster_ids = list(self.id_map.keys())
-        streams: list[dict[str, Any]] = []
-        for idx in range(0, len(broadcaster_ids), 100):
-            batch = broadcaster_ids[idx : idx + 100]
-            streams.extend(await self.helix.get_streams(batch))
-        return streams
-
-    async def _handle_streams(self, streams: list[dict[str, Any]]) -> None:
-        live_lookup = {stream["user_id"]: stream for stream in streams}
-        last_started = self.state.setdefault("last_started_at_announced", {})
-        current_live_logins = set()
-
-        for broadcaster_id, stream in live_lookup.items():
-            info = self.id_map.get(broadcaster_id)
+        # TwitchHelix batches by 100 and runs the batches concurrently.
+        return await self.helix.get_streams(self.id_map)
+
+    async def _handle_streams(self, streams: list[dict[str, Any]]) -> bool:
+        """Announce new streams and update live_now; return whether state changed."""
+        last_started = self.state["last_started_at_announced"]
+        announced = False
+        current_live_logins: set[str] = set()
+        pending: list[tuple[str, str]] = []
+        announces = []
+
+        for stream in streams:
+            info = self.id_map.get(stream["user_id"])
             if not info:
                 continue
             login = info["login"]
             current_live_logins.add(login)
             started_at = stream.get("started_at")
             if started_at and started_at != last_started.get(login):
-                await self._announce_live(info, stream)
+                pending.append((login, started_at))
+                announces.append(self._announce_live(info, stream))
+
+        if announces:
+            # Different webhooks send in parallel; DiscordWebhook orders sends per URL.
+            results = await asyncio.gather(*announces, return_exceptions=True)
+            for (login, started_at), result in zip(pending, results):
+                if isinstance(result, BaseException):
+                    # Left unrecorded so the next poll retries the announcement.
+                    self.log.error(
+                        "Failed to send Discord announcement for %s", login, exc_info=result
+                    )
+                    continue
                 last_started[login] = started_at
+                announced = True
 
+        if current_live_logins == self._live_now:
+            return announced
+        self._live_now = frozenset(current_live_logins)
         self.state["live_now"] = sorted(current_live_logins)
+        return True
 
     async def _announce_live(self, info: dict[str, Any], stream: dict[str, Any]) -> None:
-        if not info.get("announce_online", True):
+        if not info["announce_online"]:
             return
-        login = info["login"]
-        url = f"https://twitch.tv/{login}"
-        message = self._format_message(
-            info["template_online"],
-            login=login,
-            display_name=info["display_name"],
-            url=url,
+        message = info["render_online"](
             title=stream.get("title", ""),
             game=stream.get("game_name", ""),
         )
-        webhook_url = self._resolve_webhook(info)
-        try:
-            await self.webhook.send(webhook_url, message)
-        except Exception:
-            self.log.exception("Failed to send Discord announcement for %s", login)
+        await self.webhook.send(info["webhook_url"], message)
 
     def _resolve_webhook(self, info: dict[str, Any]) -> str:
         # 1. Character-specific webhook (e.g., loop_trace for reburve)
-        character = info.get("character")
+        character = info["character"]
         if character:
             characters = self.config.discord.get("characters", {})
             webhook = characters.get(character)
@@ -198,7 +283,7 @@ class Poller:
             )
 
         # 2. Named webhook override (e.g., "friends" → friends_webhook)
-        override = info.get("webhook_override")
+        override = info["webhook_override"]
         if override:
             key = f"{override}_webhook"
             webhook = self.config.discord.get(key)
@@ -211,7 +296,3 @@ class Poller:
 
         # 3. Default
         return self.config.discord["system_webhook"]
-
-    @staticmethod
-    def _format_message(template: str, **kwargs: Any) -> str:
-        return template.format_map(_SafeDict(**kwargs))